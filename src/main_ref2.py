@@ -1,11 +1,25 @@
+import atexit
+import bisect
+from collections import defaultdict
 import json
 from datetime import datetime, timedelta
 from enum import Enum, auto
 import os
-from typing import List, Dict, Optional, Union
+import re
+import sys
+import time
+from typing import List, Dict, NamedTuple, Optional, Set, Tuple, Union
 from abc import ABC, abstractmethod
 
 
+TASKS_FILE = "tasks.json"
+CHANGELOG_FILE = "changelog.jsonl"
+LEGACY_DATA_FILE = "task_manager_data.json"
+SNAPSHOT_INTERVAL = 5.0
+
+_JSON_ENCODER = json.JSONEncoder(separators=(",", ":"))
+
+
 class Priority(Enum):
     LOW = auto()
     MEDIUM = auto()
@@ -13,7 +27,11 @@ class Priority(Enum):
     CRITICAL = auto()
 
     def __str__(self):
-        return self.name.capitalize()
+        return self._str
+
+
+for _member in Priority:
+    _member._str = _member.name.capitalize()
 
 
 class TaskStatus(Enum):
@@ -23,40 +41,71 @@ class TaskStatus(Enum):
     DELETED = auto()
 
     def __str__(self):
-        return self.name.capitalize()
+        return self._str
+
+
+for _member in TaskStatus:
+    _member._str = _member.name.capitalize()
+
+
+class Change(NamedTuple):
+    action: str
+    task_data: Dict
+    timestamp: datetime
+    task_id: Optional[int] = None
 
 
 class ChangeLog:
     def __init__(self):
-        self.changes: List[Dict] = []
+        self.changes: List[Change] = []
+        self._timestamps: List[datetime] = []
 
-    def add_change(self, action: str, task_data: Dict, timestamp: datetime = None):
-        entry = {
-            "action": action,
-            "task_data": task_data,
-            "timestamp": timestamp or datetime.now()
-        }
+    def add_change(self, action: str, task_data: Dict, timestamp: datetime = None,
+                   task_id: Optional[int] = None) -> Change:
+        entry = Change(action, task_data, timestamp or datetime.now(), task_id)
         self.changes.append(entry)
+        self._timestamps.append(entry.timestamp)
+        return entry
 
-    def get_changes_since(self, since: datetime) -> List[Dict]:
-        return [change for change in self.changes if change["timestamp"] >= since]
+    def get_changes_since(self, since: datetime) -> List[Change]:
+        return self.changes[bisect.bisect_left(self._timestamps, since):]
+
+    @staticmethod
+    def entry_to_dict(change: Change) -> Dict:
+        entry = {
+            "action": change.action,
+            "task_data": change.task_data,
+            "timestamp": change.timestamp.isoformat(timespec="seconds")
+        }
+        if change.task_id is not None:
+            entry["task_id"] = change.task_id
+        return entry
 
     def to_dict(self) -> List[Dict]:
-        return [{
-            "action": change["action"],
-            "task_data": change["task_data"],
-            "timestamp": change["timestamp"].strftime("%Y-%m-%d %H:%M:%S")
-        } for change in self.changes]
+        return [self.entry_to_dict(change) for change in self.changes]
 
     @classmethod
     def from_dict(cls, data: List[Dict]) -> 'ChangeLog':
         changelog = cls()
         for entry in data:
-            changelog.changes.append({
-                "action": entry["action"],
-                "task_data": entry["task_data"],
-                "timestamp": datetime.strptime(entry["timestamp"], "%Y-%m-%d %H:%M:%S")
-            })
+            changelog.add_change(entry["action"], entry["task_data"],
+                                 datetime.fromisoformat(entry["timestamp"]),
+                                 entry.get("task_id"))
+        return changelog
+
+    @classmethod
+    def from_jsonl(cls, lines) -> 'ChangeLog':
+        changelog = cls()
+        for line in lines:
+            if not line.strip():
+                continue
+            try:
+                entry = json.loads(line)
+                changelog.add_change(entry["action"], entry["task_data"],
+                                     datetime.fromisoformat(entry["timestamp"]),
+                                     entry.get("task_id"))
+            except (KeyError, TypeError, ValueError) as e:
+                print(f"Skipping unreadable change log entry: {e}")
         return changelog
 
 
@@ -72,6 +121,9 @@ class ConsoleNotification(Notification):
 
 
 class Task:
+    __slots__ = ("title", "description", "due_date", "priority", "category",
+                 "status", "created_at", "updated_at", "completed_at")
+
     def __init__(self, 
                  title: str, 
                  description: str = "", 
@@ -107,39 +159,131 @@ class Task:
         return {
             "title": self.title,
             "description": self.description,
-            "due_date": self.due_date.strftime("%Y-%m-%d") if self.due_date else None,
+            "due_date": self.due_date.date().isoformat() if self.due_date else None,
             "priority": self.priority.name,
             "category": self.category,
             "status": self.status.name,
-            "created_at": self.created_at.strftime("%Y-%m-%d %H:%M:%S"),
-            "updated_at": self.updated_at.strftime("%Y-%m-%d %H:%M:%S"),
-            "completed_at": self.completed_at.strftime("%Y-%m-%d %H:%M:%S") if self.completed_at else None
+            "created_at": self.created_at.isoformat(timespec="seconds"),
+            "updated_at": self.updated_at.isoformat(timespec="seconds"),
+            "completed_at": self.completed_at.isoformat(timespec="seconds") if self.completed_at else None
         }
 
+    @staticmethod
+    def serialize_field(name: str, value):
+        if value is None:
+            return None
+        if name == "due_date":
+            return value.date().isoformat()
+        if isinstance(value, datetime):
+            return value.isoformat(timespec="seconds")
+        if isinstance(value, Enum):
+            return value.name
+        return value
+
+    @staticmethod
+    def deserialize_field(name: str, value):
+        if value is None:
+            return None
+        if name in ("due_date", "created_at", "updated_at", "completed_at"):
+            return datetime.fromisoformat(value)
+        if name == "priority":
+            return Priority[value]
+        if name == "status":
+            return TaskStatus[value]
+        return value
+
     @classmethod
     def from_dict(cls, data: Dict) -> 'Task':
         task = cls(
             title=data["title"],
             description=data.get("description", ""),
-            due_date=datetime.strptime(data["due_date"], "%Y-%m-%d") if data.get("due_date") else None,
+            due_date=datetime.fromisoformat(data["due_date"]) if data.get("due_date") else None,
             priority=Priority[data.get("priority", "MEDIUM")],
             category=data.get("category", "General")
         )
         task.status = TaskStatus[data.get("status", "PENDING")]
-        task.created_at = datetime.strptime(data["created_at"], "%Y-%m-%d %H:%M:%S")
-        task.updated_at = datetime.strptime(data["updated_at"], "%Y-%m-%d %H:%M:%S")
+        task.created_at = datetime.fromisoformat(data["created_at"])
+        task.updated_at = datetime.fromisoformat(data["updated_at"])
         if data.get("completed_at"):
-            task.completed_at = datetime.strptime(data["completed_at"], "%Y-%m-%d %H:%M:%S")
+            task.completed_at = datetime.fromisoformat(data["completed_at"])
         return task
 
     def is_overdue(self) -> bool:
-        return (self.due_date and self.due_date < datetime.now() 
+        return self.is_overdue_at(datetime.now())
+
+    def is_overdue_at(self, now: datetime) -> bool:
+        return (self.due_date and self.due_date < now
                 and self.status != TaskStatus.COMPLETED)
 
     def days_until_due(self) -> Optional[int]:
+        return self.days_until_due_at(datetime.now())
+
+    def days_until_due_at(self, now: datetime) -> Optional[int]:
         if not self.due_date:
             return None
-        return (self.due_date - datetime.now()).days
+        return (self.due_date - now).days
+
+
+class TaskIndex:
+    def __init__(self):
+        self.by_status: Dict[TaskStatus, Set[int]] = defaultdict(set)
+        self.by_priority: Dict[Priority, Set[int]] = defaultdict(set)
+        self.by_category: Dict[str, Set[int]] = defaultdict(set)
+        self.by_due_date: List[Tuple[datetime, int]] = []
+
+    def _keyed(self, task: Task):
+        return ((self.by_status, task.status),
+                (self.by_priority, task.priority),
+                (self.by_category, task.category))
+
+    def add(self, task_id: int, task: Task):
+        for index, key in self._keyed(task):
+            index[key].add(task_id)
+        if task.due_date:
+            bisect.insort(self.by_due_date, (task.due_date, task_id))
+
+    def remove(self, task_id: int, task: Task):
+        for index, key in self._keyed(task):
+            task_ids = index.get(key)
+            if task_ids is not None:
+                task_ids.discard(task_id)
+                if not task_ids:
+                    del index[key]
+        if task.due_date:
+            entry = (task.due_date, task_id)
+            pos = bisect.bisect_left(self.by_due_date, entry)
+            if pos < len(self.by_due_date) and self.by_due_date[pos] == entry:
+                del self.by_due_date[pos]
+
+    def due_between(self, start: Optional[datetime], end: datetime) -> Set[int]:
+        lo = bisect.bisect_left(self.by_due_date, (start,)) if start else 0
+        hi = bisect.bisect_left(self.by_due_date, (end,))
+        return {task_id for _, task_id in self.by_due_date[lo:hi]}
+
+    def candidates(self,
+                   status: Optional[TaskStatus] = None,
+                   priority: Optional[Priority] = None,
+                   category: Optional[str] = None) -> Optional[Set[int]]:
+        if category is not None and category not in self.by_category:
+            return set()
+        selected = []
+        if status is not None:
+            selected.append(self.by_status.get(status, set()))
+        if priority is not None:
+            selected.append(self.by_priority.get(priority, set()))
+        if category is not None:
+            selected.append(self.by_category.get(category, set()))
+        if not selected:
+            return None
+        selected.sort(key=len)
+        return selected[0].intersection(*selected[1:])
+
+
+def _due_window_end(now: datetime, days: int) -> datetime:
+    try:
+        return now + timedelta(days=days + 1)
+    except OverflowError:
+        return datetime.max if days >= 0 else datetime.min
 
 
 class TaskFilter:
@@ -155,27 +299,53 @@ class TaskFilter:
         self.overdue_only = overdue_only
         self.due_in_days = due_in_days
 
-    def apply(self, tasks: List[Task]) -> List[Task]:
-        filtered = tasks
-        
-        if self.status is not None:
-            filtered = [t for t in filtered if t.status == self.status]
+    def apply(self, tasks: List[Task], index: Optional[TaskIndex] = None) -> List[Task]:
+        if index is not None:
+            return self._apply_indexed(tasks, index)
+
+        status, priority, category = self.status, self.priority, self.category
+        overdue_only, due_in_days = self.overdue_only, self.due_in_days
+        if (status is None and priority is None and category is None
+                and not overdue_only and due_in_days is None):
+            return tasks
         
-        if self.priority is not None:
-            filtered = [t for t in filtered if t.priority == self.priority]
+        now = datetime.now()
+        filtered = []
+        for t in tasks:
+            if status is not None and t.status is not status:
+                continue
+            if priority is not None and t.priority is not priority:
+                continue
+            if category is not None and t.category != category:
+                continue
+            if overdue_only and not t.is_overdue_at(now):
+                continue
+            if due_in_days is not None:
+                days = t.days_until_due_at(now)
+                if days is None or not 0 <= days <= due_in_days:
+                    continue
+            filtered.append(t)
         
-        if self.category is not None:
-            filtered = [t for t in filtered if t.category == self.category]
+        return filtered
+
+    def _apply_indexed(self, tasks: List[Task], index: TaskIndex) -> List[Task]:
+        now = datetime.now()
+        task_ids = index.candidates(self.status, self.priority, self.category)
+        if task_ids is not None and not task_ids:
+            return []
         
         if self.overdue_only:
-            filtered = [t for t in filtered if t.is_overdue()]
+            overdue = index.due_between(None, now)
+            overdue -= index.by_status.get(TaskStatus.COMPLETED, set())
+            task_ids = overdue if task_ids is None else task_ids & overdue
         
         if self.due_in_days is not None:
-            filtered = [t for t in filtered 
-                       if t.days_until_due() is not None 
-                       and 0 <= t.days_until_due() <= self.due_in_days]
+            due_soon = index.due_between(now, _due_window_end(now, self.due_in_days))
+            task_ids = due_soon if task_ids is None else task_ids & due_soon
         
-        return filtered
+        if task_ids is None:
+            return tasks
+        return [tasks[i] for i in sorted(task_ids)]
 
 
 class TaskManager:
@@ -183,25 +353,66 @@ class TaskManager:
         self.tasks: List[Task] = []
         self.changelog = ChangeLog()
         self.notification = notification or ConsoleNotification()
+        self._index = TaskIndex()
+        self._dirty = False
+        self._last_snapshot = time.monotonic()
         self.load_data()
+        self._changelog_file = self._open_changelog()
+        atexit.register(self.close)
+
+    def close(self):
+        self._flush_snapshot()
+        self._changelog_file.close()
+        atexit.unregister(self.close)
+
+    @staticmethod
+    def _open_changelog():
+        torn_tail = False
+        if os.path.exists(CHANGELOG_FILE) and os.path.getsize(CHANGELOG_FILE) > 0:
+            with open(CHANGELOG_FILE, "rb") as f:
+                f.seek(-1, os.SEEK_END)
+                torn_tail = f.read(1) != b"\n"
+        changelog_file = open(CHANGELOG_FILE, "a")
+        if torn_tail:
+            changelog_file.write("\n")
+            changelog_file.flush()
+        return changelog_file
+
+    def _record_change(self, action: str, task_id: int, task_data: Dict):
+        entry = self.changelog.add_change(action, task_data, task_id=task_id)
+        self._changelog_file.write(
+            _JSON_ENCODER.encode(ChangeLog.entry_to_dict(entry)) + "\n")
+        self._changelog_file.flush()
+        self._mark_dirty()
+
+    def _mark_dirty(self):
+        self._dirty = True
+        if time.monotonic() - self._last_snapshot >= SNAPSHOT_INTERVAL:
+            self.save_data()
+
+    def _flush_snapshot(self):
+        if self._dirty:
+            self.save_data()
 
     def add_task(self, task: Task) -> Task:
         self.tasks.append(task)
-        self.changelog.add_change("CREATE", task.to_dict())
-        self.save_data()
+        self._index.add(len(self.tasks) - 1, task)
+        self._record_change("CREATE", len(self.tasks) - 1, task.to_dict())
         self.notification.send(f"Task added: {task.title}")
         return task
 
     def update_task(self, task_id: int, **kwargs) -> Optional[Task]:
         if 0 <= task_id < len(self.tasks):
             task = self.tasks[task_id]
-            old_data = task.to_dict()
+            changed = {key: getattr(task, key) for key, value in kwargs.items()
+                       if hasattr(task, key) and getattr(task, key) != value}
+            self._index.remove(task_id, task)
             task.update(**kwargs)
-            self.changelog.add_change("UPDATE", {
-                "old": old_data,
-                "new": task.to_dict()
+            self._index.add(task_id, task)
+            self._record_change("UPDATE", task_id, {
+                "old": {key: Task.serialize_field(key, value) for key, value in changed.items()},
+                "new": {key: Task.serialize_field(key, kwargs[key]) for key in changed}
             })
-            self.save_data()
             self.notification.send(f"Task updated: {task.title}")
             return task
         return None
@@ -209,9 +420,10 @@ class TaskManager:
     def delete_task(self, task_id: int) -> bool:
         if 0 <= task_id < len(self.tasks):
             task = self.tasks[task_id]
+            self._index.remove(task_id, task)
             task.status = TaskStatus.DELETED
-            self.changelog.add_change("DELETE", task.to_dict())
-            self.save_data()
+            self._index.add(task_id, task)
+            self._record_change("DELETE", task_id, task.to_dict())
             self.notification.send(f"Task deleted: {task.title}")
             return True
         return False
@@ -219,9 +431,10 @@ class TaskManager:
     def complete_task(self, task_id: int) -> Optional[Task]:
         if 0 <= task_id < len(self.tasks):
             task = self.tasks[task_id]
+            self._index.remove(task_id, task)
             task.mark_as_completed()
-            self.changelog.add_change("COMPLETE", task.to_dict())
-            self.save_data()
+            self._index.add(task_id, task)
+            self._record_change("COMPLETE", task_id, task.to_dict())
             self.notification.send(f"Task completed: {task.title}")
             return task
         return None
@@ -229,9 +442,10 @@ class TaskManager:
     def archive_task(self, task_id: int) -> Optional[Task]:
         if 0 <= task_id < len(self.tasks):
             task = self.tasks[task_id]
+            self._index.remove(task_id, task)
             task.archive()
-            self.changelog.add_change("ARCHIVE", task.to_dict())
-            self.save_data()
+            self._index.add(task_id, task)
+            self._record_change("ARCHIVE", task_id, task.to_dict())
             return task
         return None
 
@@ -241,42 +455,119 @@ class TaskManager:
         return None
 
     def filter_tasks(self, task_filter: TaskFilter) -> List[Task]:
-        return task_filter.apply(self.tasks)
+        return task_filter.apply(self.tasks, self._index)
 
     def get_categories(self) -> List[str]:
-        return list(set(task.category for task in self.tasks))
+        return list(self._index.by_category)
+
+    def _rebuild_index(self):
+        self._index = TaskIndex()
+        for task_id, task in enumerate(self.tasks):
+            self._index.add(task_id, task)
+
+    def _reset_data(self):
+        self.tasks = []
+        self.changelog = ChangeLog()
+        self._index = TaskIndex()
 
     def save_data(self):
         data = {
             "tasks": [task.to_dict() for task in self.tasks],
-            "changelog": self.changelog.to_dict()
+            "changelog_length": len(self.changelog.changes)
         }
-        with open("task_manager_data.json", "w") as f:
-            json.dump(data, f, indent=2)
+        with open(TASKS_FILE, "w") as f:
+            f.write(_JSON_ENCODER.encode(data))
+        self._dirty = False
+        self._last_snapshot = time.monotonic()
 
     def load_data(self):
-        if os.path.exists("task_manager_data.json"):
-            with open("task_manager_data.json", "r") as f:
-                try:
+        if (os.path.exists(LEGACY_DATA_FILE) and not os.path.exists(TASKS_FILE)
+                and not os.path.exists(CHANGELOG_FILE)):
+            self._migrate_legacy_data()
+            return
+
+        self._reset_data()
+        snapshot_length = 0
+        if os.path.exists(TASKS_FILE):
+            try:
+                with open(TASKS_FILE, "r") as f:
                     data = json.load(f)
-                    self.tasks = [Task.from_dict(task_data) for task_data in data.get("tasks", [])]
-                    self.changelog = ChangeLog.from_dict(data.get("changelog", []))
-                except (json.JSONDecodeError, KeyError) as e:
-                    print(f"Error loading data: {e}")
-                    self.tasks = []
-                    self.changelog = ChangeLog()
+                self.tasks = [Task.from_dict(task_data) for task_data in data.get("tasks", [])]
+                self._rebuild_index()
+                snapshot_length = data.get("changelog_length")
+            except (KeyError, TypeError, ValueError) as e:
+                print(f"Error loading data: {e}")
+                self._reset_data()
+        if os.path.exists(CHANGELOG_FILE):
+            with open(CHANGELOG_FILE, "r") as f:
+                self.changelog = ChangeLog.from_jsonl(f)
+        if snapshot_length is None:
+            snapshot_length = len(self.changelog.changes)
+
+        pending = self.changelog.changes[snapshot_length:]
+        if pending:
+            for change in pending:
+                try:
+                    self._replay_change(change)
+                except (AttributeError, IndexError, KeyError, TypeError, ValueError) as e:
+                    print(f"Skipping change log entry during replay: {e}")
+            self._rebuild_index()
+            self.save_data()
+
+    def _replay_change(self, change: Change):
+        if change.action == "CREATE":
+            self.tasks.append(Task.from_dict(change.task_data))
+        elif change.task_id is None or not 0 <= change.task_id < len(self.tasks):
+            raise IndexError(f"no task {change.task_id} for {change.action}")
+        elif change.action == "UPDATE":
+            task = self.tasks[change.task_id]
+            for key, value in change.task_data["new"].items():
+                setattr(task, key, Task.deserialize_field(key, value))
+            task.updated_at = change.timestamp
+        else:
+            self.tasks[change.task_id] = Task.from_dict(change.task_data)
+
+    def _migrate_legacy_data(self):
+        with open(LEGACY_DATA_FILE, "r") as f:
+            try:
+                data = json.load(f)
+                self.tasks = [Task.from_dict(task_data) for task_data in data.get("tasks", [])]
+                self._rebuild_index()
+                self.changelog = ChangeLog.from_dict(data.get("changelog", []))
+            except (KeyError, TypeError, ValueError) as e:
+                print(f"Error loading data: {e}")
+                self._reset_data()
+                return
+        with open(CHANGELOG_FILE, "w") as f:
+            f.writelines(_JSON_ENCODER.encode(entry) + "\n"
+                         for entry in self.changelog.to_dict())
+        self.save_data()
+
+    def _pending_tasks(self, task_ids: Set[int]) -> List[Task]:
+        task_ids &= self._index.by_status.get(TaskStatus.PENDING, set())
+        return [self.tasks[i] for i in sorted(task_ids)]
 
     def get_upcoming_tasks(self, days: int = 7) -> List[Task]:
-        return self.filter_tasks(TaskFilter(
-            status=TaskStatus.PENDING,
-            due_in_days=days
-        ))
+        now = datetime.now()
+        return self._pending_tasks(
+            self._index.due_between(now, _due_window_end(now, days)))
 
     def get_overdue_tasks(self) -> List[Task]:
-        return self.filter_tasks(TaskFilter(
-            status=TaskStatus.PENDING,
-            overdue_only=True
-        ))
+        return self._pending_tasks(self._index.due_between(None, datetime.now()))
+
+
+_DATE_RE = re.compile(r"^(\d{4})-(\d{2})-(\d{2})$")
+
+_STATUS_BY_CHOICE = (None, TaskStatus.PENDING, TaskStatus.COMPLETED,
+                     TaskStatus.ARCHIVED, TaskStatus.DELETED)
+_PRIORITY_BY_CHOICE = (None, Priority.LOW, Priority.MEDIUM,
+                       Priority.HIGH, Priority.CRITICAL)
+
+
+def _choice_lookup(table: tuple, choice: str):
+    if choice.isdecimal() and not choice.startswith("0") and int(choice) < len(table):
+        return table[int(choice)]
+    return None
 
 
 class TaskManagerUI:
@@ -329,10 +620,14 @@ class TaskManagerUI:
             value = input(prompt).strip()
             if not value:
                 return None
-            try:
-                return datetime.strptime(value, "%Y-%m-%d")
-            except ValueError:
-                print("Invalid date format. Please use YYYY-MM-DD.")
+            match = _DATE_RE.match(value)
+            if match:
+                try:
+                    return datetime(int(match[1]), int(match[2]), int(match[3]))
+                except ValueError as e:
+                    print(f"Invalid date: {e}.")
+                    continue
+            print("Invalid date format. Please use YYYY-MM-DD.")
 
     def _get_priority_input(self) -> Priority:
         print("\nPriority:")
@@ -342,7 +637,7 @@ class TaskManagerUI:
         while True:
             choice = input("Select priority (1-4): ")
             if choice.isdigit() and 1 <= int(choice) <= 4:
-                return list(Priority)[int(choice)-1]
+                return _PRIORITY_BY_CHOICE[int(choice)]
             print("Invalid choice. Please enter a number between 1 and 4.")
 
     def display_tasks(self, tasks: List[Task], show_index: bool = True):
@@ -350,14 +645,29 @@ class TaskManagerUI:
             print("\nNo tasks found.")
             return
         
-        print("\nTasks:")
+        now = datetime.now()
+        lines = ["\nTasks:"]
         for i, task in enumerate(tasks):
             prefix = f"{i+1}. " if show_index else "- "
             status = str(task.status)
             priority = str(task.priority)
             due_date = f" (Due: {task.due_date.strftime('%Y-%m-%d')})" if task.due_date else ""
-            overdue = " [OVERDUE]" if task.is_overdue() else ""
-            print(f"{prefix}[{status}] [{priority}] {task.title}{due_date}{overdue}")
+            overdue = " [OVERDUE]" if task.is_overdue_at(now) else ""
+            lines.append(f"{prefix}[{status}] [{priority}] {task.title}{due_date}{overdue}")
+        sys.stdout.write("\n".join(lines) + "\n")
+
+    def display_changes(self, changes: List[Change], days: int):
+        lines = [f"\nChange Log (last {days} days):"]
+        for change in changes:
+            lines.append(f"\n{change.timestamp.strftime('%Y-%m-%d %H:%M:%S')} - {change.action}")
+            if change.action == "UPDATE":
+                lines.append("Old values:")
+                lines.append(json.dumps(change.task_data['old'], indent=2))
+                lines.append("New values:")
+                lines.append(json.dumps(change.task_data['new'], indent=2))
+            else:
+                lines.append(json.dumps(change.task_data, indent=2))
+        sys.stdout.write("\n".join(lines) + "\n")
 
     def display_task_details(self, task: Task):
         print("\nTask Details:")
@@ -438,23 +748,9 @@ class TaskManagerUI:
                         "Priority (1-Low, 2-Medium, 3-High, 4-Critical, Enter for all): ")
                     category = self._get_input("Category (Enter for all): ")
                     
-                    status_map = {
-                        "1": TaskStatus.PENDING,
-                        "2": TaskStatus.COMPLETED,
-                        "3": TaskStatus.ARCHIVED,
-                        "4": TaskStatus.DELETED
-                    }
-                    
-                    priority_map = {
-                        "1": Priority.LOW,
-                        "2": Priority.MEDIUM,
-                        "3": Priority.HIGH,
-                        "4": Priority.CRITICAL
-                    }
-                    
                     task_filter = TaskFilter(
-                        status=status_map.get(status_choice),
-                        priority=priority_map.get(priority_choice),
+                        status=_choice_lookup(_STATUS_BY_CHOICE, status_choice),
+                        priority=_choice_lookup(_PRIORITY_BY_CHOICE, priority_choice),
                         category=category if category else None
                     )
                     
@@ -474,17 +770,7 @@ class TaskManagerUI:
                     days = int(self._get_input("Show changes from how many days ago? (7): ", default="7"))
                     since = datetime.now() - timedelta(days=days)
                     changes = self.manager.changelog.get_changes_since(since)
-                    
-                    print(f"\nChange Log (last {days} days):")
-                    for change in changes:
-                        print(f"\n{change['timestamp'].strftime('%Y-%m-%d %H:%M:%S')} - {change['action']}")
-                        if change['action'] == "UPDATE":
-                            print("Old values:")
-                            print(json.dumps(change['task_data']['old'], indent=2))
-                            print("New values:")
-                            print(json.dumps(change['task_data']['new'], indent=2))
-                        else:
-                            print(json.dumps(change['task_data'], indent=2))
+                    self.display_changes(changes, days)
                 
                 elif choice == "12":
                     print("\nGoodbye!")
@@ -500,7 +786,10 @@ class TaskManagerUI:
 def main():
     manager = TaskManager()
     ui = TaskManagerUI(manager)
-    ui.run()
+    try:
+        ui.run()
+    finally:
+        manager.close()
 
 
 if __name__ == "__main__":
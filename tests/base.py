@@ -0,0 +1,44 @@
+import atexit
+import os
+import tempfile
+import unittest
+
+from src.main_ref2 import Notification, TaskManager
+
+
+class SilentNotification(Notification):
+    def send(self, message: str):
+        pass
+
+
+def titles(tasks):
+    return [task.title for task in tasks]
+
+
+class StorageTestCase(unittest.TestCase):
+    def setUp(self):
+        self._cwd = os.getcwd()
+        self._tmp = tempfile.TemporaryDirectory()
+        os.chdir(self._tmp.name)
+        self._managers = []
+
+    def tearDown(self):
+        for manager in self._managers:
+            if not manager._changelog_file.closed:
+                manager.close()
+        os.chdir(self._cwd)
+        self._tmp.cleanup()
+
+    def open_manager(self) -> TaskManager:
+        manager = TaskManager(SilentNotification())
+        self._managers.append(manager)
+        return manager
+
+    def crash(self, manager: TaskManager):
+        # Drop the manager without flushing its snapshot.
+        manager._changelog_file.close()
+        atexit.unregister(manager.close)
+
+    def reopen(self, manager: TaskManager) -> TaskManager:
+        manager.close()
+        return self.open_manager()
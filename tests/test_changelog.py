@@ -0,0 +1,62 @@
+import unittest
+from datetime import datetime
+
+from src.main_ref2 import ChangeLog, Priority, Task
+from tests.base import StorageTestCase
+
+
+class ChangeLogTest(unittest.TestCase):
+    def setUp(self):
+        self.changelog = ChangeLog()
+        for day in (1, 3, 3, 5):
+            self.changelog.add_change("CREATE", {"day": day}, datetime(2024, 1, day))
+
+    def _days(self, changes):
+        return [change.task_data["day"] for change in changes]
+
+    def test_changes_since_between_entries(self):
+        self.assertEqual(self._days(self.changelog.get_changes_since(datetime(2024, 1, 2))),
+                         [3, 3, 5])
+
+    def test_changes_since_includes_equal_timestamps(self):
+        self.assertEqual(self._days(self.changelog.get_changes_since(datetime(2024, 1, 3))),
+                         [3, 3, 5])
+
+    def test_changes_since_bounds(self):
+        self.assertEqual(self._days(self.changelog.get_changes_since(datetime(2023, 1, 1))),
+                         [1, 3, 3, 5])
+        self.assertEqual(self.changelog.get_changes_since(datetime(2024, 1, 6)), [])
+
+    def test_changes_since_after_loading(self):
+        lines = ['{"action":"CREATE","task_data":{"day":%d},"timestamp":"2024-01-0%dT00:00:00"}\n'
+                 % (day, day) for day in (1, 3, 5)]
+        for changelog in (ChangeLog.from_dict(self.changelog.to_dict()),
+                          ChangeLog.from_jsonl(lines)):
+            self.assertEqual(self._days(changelog.get_changes_since(datetime(2024, 1, 4))), [5])
+
+
+class UpdateChangeTest(StorageTestCase):
+    def setUp(self):
+        super().setUp()
+        self.manager = self.open_manager()
+        self.manager.add_task(Task("a", due_date=datetime(2030, 1, 2)))
+
+    def test_update_logs_only_changed_fields(self):
+        self.manager.update_task(0, title="a", priority=Priority.HIGH,
+                                 due_date=datetime(2030, 2, 3))
+        change = self.manager.changelog.changes[-1]
+        self.assertEqual(change.action, "UPDATE")
+        self.assertEqual(change.task_id, 0)
+        self.assertEqual(change.task_data, {
+            "old": {"priority": "MEDIUM", "due_date": "2030-01-02"},
+            "new": {"priority": "HIGH", "due_date": "2030-02-03"}
+        })
+
+    def test_update_without_changes(self):
+        self.manager.update_task(0, title="a", due_date=datetime(2030, 1, 2))
+        change = self.manager.changelog.changes[-1]
+        self.assertEqual(change.task_data, {"old": {}, "new": {}})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,121 @@
+import json
+import os
+import unittest
+from datetime import datetime
+
+from src.main_ref2 import (
+    CHANGELOG_FILE, LEGACY_DATA_FILE, TASKS_FILE, Priority, Task, TaskStatus,
+)
+from tests.base import StorageTestCase, titles
+
+
+class PersistenceTest(StorageTestCase):
+    def test_reload_round_trip(self):
+        manager = self.open_manager()
+        manager.add_task(Task("a", due_date=datetime(2030, 1, 2), category="Work"))
+        manager.add_task(Task("b", priority=Priority.HIGH))
+        manager.complete_task(1)
+        expected = [task.to_dict() for task in manager.tasks]
+
+        reloaded = self.reopen(manager)
+        self.assertEqual([task.to_dict() for task in reloaded.tasks], expected)
+        self.assertEqual(len(reloaded.changelog.changes), 3)
+
+    def test_replays_changes_after_crash(self):
+        manager = self.open_manager()
+        manager.add_task(Task("a"))
+        manager.add_task(Task("b"))
+        manager.save_data()
+        manager.update_task(0, title="A", priority=Priority.CRITICAL)
+        manager.archive_task(1)
+        manager.add_task(Task("c", category="Home"))
+        self.crash(manager)
+
+        reloaded = self.open_manager()
+        self.assertEqual(titles(reloaded.tasks), ["A", "b", "c"])
+        self.assertIs(reloaded.tasks[0].priority, Priority.CRITICAL)
+        self.assertIs(reloaded.tasks[1].status, TaskStatus.ARCHIVED)
+        self.assertEqual(sorted(reloaded.get_categories()), ["General", "Home"])
+
+    def test_replays_log_without_snapshot(self):
+        manager = self.open_manager()
+        manager.add_task(Task("a"))
+        manager.add_task(Task("b"))
+        self.crash(manager)
+        self.assertFalse(os.path.exists(TASKS_FILE))
+
+        reloaded = self.open_manager()
+        self.assertEqual(titles(reloaded.tasks), ["a", "b"])
+
+    def test_torn_changelog_line_keeps_tasks(self):
+        manager = self.open_manager()
+        for title in ("a", "b", "c"):
+            manager.add_task(Task(title))
+        manager.close()
+        with open(CHANGELOG_FILE, "a") as f:
+            f.write('{"action":"CRE')
+
+        reloaded = self.open_manager()
+        self.assertEqual(titles(reloaded.tasks), ["a", "b", "c"])
+        reloaded.add_task(Task("d"))
+        reloaded = self.reopen(reloaded)
+        self.assertEqual(titles(reloaded.tasks), ["a", "b", "c", "d"])
+        self.assertEqual(len(reloaded.changelog.changes), 4)
+
+    def test_migrates_legacy_data(self):
+        legacy = {
+            "tasks": [{
+                "title": "old", "description": "", "due_date": "2024-01-02",
+                "priority": "HIGH", "category": "G", "status": "PENDING",
+                "created_at": "2024-01-01 10:00:00", "updated_at": "2024-01-01 10:00:00",
+                "completed_at": None
+            }],
+            "changelog": [{"action": "CREATE", "task_data": {},
+                           "timestamp": "2024-01-01 10:00:00"}]
+        }
+        with open(LEGACY_DATA_FILE, "w") as f:
+            json.dump(legacy, f)
+
+        manager = self.open_manager()
+        self.assertEqual(titles(manager.tasks), ["old"])
+        self.assertEqual(manager.tasks[0].due_date, datetime(2024, 1, 2))
+        self.assertTrue(os.path.exists(TASKS_FILE))
+
+        reloaded = self.reopen(manager)
+        self.assertEqual(titles(reloaded.tasks), ["old"])
+        self.assertEqual(len(reloaded.changelog.changes), 1)
+
+    def test_legacy_file_does_not_override_change_log(self):
+        with open(LEGACY_DATA_FILE, "w") as f:
+            json.dump({"tasks": [], "changelog": []}, f)
+        manager = self.open_manager()
+        manager.add_task(Task("a"))
+        manager.add_task(Task("b"))
+        manager.close()
+        os.remove(TASKS_FILE)
+
+        reloaded = self.open_manager()
+        self.assertEqual(titles(reloaded.tasks), ["a", "b"])
+        self.assertEqual(len(reloaded.changelog.changes), 2)
+
+    def test_invalid_task_record_starts_clean(self):
+        with open(TASKS_FILE, "w") as f:
+            json.dump({"tasks": [{"title": "broken"}], "changelog_length": 0}, f)
+
+        manager = self.open_manager()
+        self.assertEqual(len(manager.tasks), 0)
+        self.assertIsNone(manager.get_task(0))
+
+    def test_malformed_timestamp_starts_clean(self):
+        record = {"title": "broken", "created_at": "yesterday",
+                  "updated_at": "2024-01-01T00:00:00"}
+        with open(TASKS_FILE, "w") as f:
+            json.dump({"tasks": [record], "changelog_length": 0}, f)
+
+        manager = self.open_manager()
+        self.assertEqual(len(manager.tasks), 0)
+        self.assertIsNone(manager.get_task(0))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,76 @@
+import itertools
+import random
+import unittest
+from datetime import datetime, timedelta
+
+from src.main_ref2 import Priority, Task, TaskFilter, TaskStatus
+from tests.base import StorageTestCase, titles
+
+
+class TaskIndexTest(StorageTestCase):
+    def setUp(self):
+        super().setUp()
+        rng = random.Random(1)
+        now = datetime.now()
+        self.manager = self.open_manager()
+        for i in range(200):
+            due_date = rng.choice([None, now + timedelta(days=rng.randint(-20, 20),
+                                                         hours=rng.randint(0, 23))])
+            self.manager.add_task(Task(f"t{i}", due_date=due_date,
+                                       priority=rng.choice(list(Priority)),
+                                       category=rng.choice("abc")))
+        for _ in range(80):
+            task_id = rng.randrange(200)
+            action = rng.randrange(4)
+            if action == 0:
+                self.manager.complete_task(task_id)
+            elif action == 1:
+                self.manager.archive_task(task_id)
+            elif action == 2:
+                self.manager.delete_task(task_id)
+            else:
+                self.manager.update_task(task_id, category=rng.choice("abcd"),
+                                         priority=rng.choice(list(Priority)),
+                                         due_date=now + timedelta(days=rng.randint(-5, 5)))
+
+    def test_filter_tasks_matches_scan(self):
+        combos = itertools.product([None, *TaskStatus], [None, *Priority],
+                                   [None, "a", "d", "missing"], [False, True], [None, 0, 3])
+        for status, priority, category, overdue_only, due_in_days in combos:
+            task_filter = TaskFilter(status, priority, category, overdue_only, due_in_days)
+            self.assertEqual(titles(self.manager.filter_tasks(task_filter)),
+                             titles(task_filter.apply(list(self.manager.tasks))))
+
+    def test_upcoming_and_overdue_match_scan(self):
+        tasks = list(self.manager.tasks)
+        for days in (0, 7, 10 ** 7):
+            expected = [t for t in tasks if t.status == TaskStatus.PENDING
+                        and t.days_until_due() is not None and 0 <= t.days_until_due() <= days]
+            self.assertEqual(titles(self.manager.get_upcoming_tasks(days)), titles(expected))
+        expected = [t for t in tasks if t.status == TaskStatus.PENDING and t.is_overdue()]
+        self.assertEqual(titles(self.manager.get_overdue_tasks()), titles(expected))
+
+    def test_large_due_in_days_does_not_overflow(self):
+        task_filter = TaskFilter(due_in_days=10 ** 10)
+        self.assertEqual(titles(self.manager.filter_tasks(task_filter)),
+                         titles(task_filter.apply(list(self.manager.tasks))))
+
+    def test_categories(self):
+        self.assertEqual(sorted(self.manager.get_categories()),
+                         sorted({task.category for task in self.manager.tasks}))
+
+    def test_unknown_category_short_circuits(self):
+        self.assertEqual(self.manager.filter_tasks(TaskFilter(category="missing")), [])
+        self.assertEqual(self.manager.filter_tasks(
+            TaskFilter(status=TaskStatus.PENDING, category="missing", overdue_only=True)), [])
+
+    def test_category_dropped_when_last_task_leaves(self):
+        task_id = len(self.manager.tasks)
+        self.manager.add_task(Task("solo", category="once"))
+        self.assertIn("once", self.manager.get_categories())
+        self.manager.update_task(task_id, category="a")
+        self.assertNotIn("once", self.manager.get_categories())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,95 @@
+import contextlib
+import io
+import unittest
+from datetime import datetime
+from unittest import mock
+
+from src.main_ref2 import (
+    _PRIORITY_BY_CHOICE, _STATUS_BY_CHOICE, Change, Priority, Task, TaskManagerUI,
+    TaskStatus, _choice_lookup,
+)
+
+
+class DateInputTest(unittest.TestCase):
+    def _read_date(self, *answers):
+        output = io.StringIO()
+        with mock.patch("builtins.input", side_effect=answers), \
+                contextlib.redirect_stdout(output):
+            value = TaskManagerUI(None)._get_date_input("Due date: ")
+        return value, output.getvalue()
+
+    def test_accepts_iso_date(self):
+        self.assertEqual(self._read_date("2024-02-29")[0], datetime(2024, 2, 29))
+
+    def test_empty_input_means_no_date(self):
+        self.assertIsNone(self._read_date("")[0])
+
+    def test_rejects_out_of_range_date(self):
+        value, output = self._read_date("2024-02-30", "2024-03-01")
+        self.assertEqual(value, datetime(2024, 3, 1))
+        self.assertIn("Invalid date", output)
+
+    def test_rejects_unpadded_date(self):
+        value, output = self._read_date("2024-1-1", "")
+        self.assertIsNone(value)
+        self.assertIn("Invalid date format. Please use YYYY-MM-DD.", output)
+
+
+class ChoiceLookupTest(unittest.TestCase):
+    def test_menu_choices(self):
+        self.assertIs(_choice_lookup(_STATUS_BY_CHOICE, "1"), TaskStatus.PENDING)
+        self.assertIs(_choice_lookup(_STATUS_BY_CHOICE, "4"), TaskStatus.DELETED)
+        self.assertIs(_choice_lookup(_PRIORITY_BY_CHOICE, "3"), Priority.HIGH)
+
+    def test_other_input_means_all(self):
+        for choice in ("", "0", "5", "x", "01", "\u00b2"):
+            self.assertIsNone(_choice_lookup(_STATUS_BY_CHOICE, choice), choice)
+            self.assertIsNone(_choice_lookup(_PRIORITY_BY_CHOICE, choice), choice)
+
+
+class DisplayTest(unittest.TestCase):
+    def _capture(self, method, *args, **kwargs):
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            method(*args, **kwargs)
+        return output.getvalue()
+
+    def test_display_tasks_output(self):
+        overdue = Task("a", due_date=datetime(2000, 1, 1), priority=Priority.HIGH)
+        done = Task("b", due_date=datetime(2000, 1, 2))
+        done.mark_as_completed()
+        undated = Task("c", priority=Priority.LOW)
+        ui = TaskManagerUI(None)
+
+        self.assertEqual(self._capture(ui.display_tasks, [overdue, done, undated]),
+                         "\nTasks:\n"
+                         "1. [Pending] [High] a (Due: 2000-01-01) [OVERDUE]\n"
+                         "2. [Completed] [Medium] b (Due: 2000-01-02)\n"
+                         "3. [Pending] [Low] c\n")
+        self.assertEqual(self._capture(ui.display_tasks, [undated], show_index=False),
+                         "\nTasks:\n- [Pending] [Low] c\n")
+        self.assertEqual(self._capture(ui.display_tasks, []), "\nNo tasks found.\n")
+
+    def test_display_changes_output(self):
+        changes = [
+            Change("CREATE", {"title": "a"}, datetime(2024, 1, 1, 10, 0, 0), 0),
+            Change("UPDATE", {"old": {"title": "a"}, "new": {"title": "b"}},
+                   datetime(2024, 1, 2, 11, 30, 5), 0),
+        ]
+        ui = TaskManagerUI(None)
+
+        self.assertEqual(self._capture(ui.display_changes, changes, 7),
+                         "\nChange Log (last 7 days):\n"
+                         "\n2024-01-01 10:00:00 - CREATE\n"
+                         '{\n  "title": "a"\n}\n'
+                         "\n2024-01-02 11:30:05 - UPDATE\n"
+                         "Old values:\n"
+                         '{\n  "title": "a"\n}\n'
+                         "New values:\n"
+                         '{\n  "title": "b"\n}\n')
+        self.assertEqual(self._capture(ui.display_changes, [], 3),
+                         "\nChange Log (last 3 days):\n")
+
+
+if __name__ == "__main__":
+    unittest.main()